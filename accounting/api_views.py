@@ -2,7 +2,7 @@ from django.db.models import Q, Sum, Count
 from django.contrib import messages
 from django.core.paginator import Paginator
 import json
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 from datetime import datetime
 from .models import VoucherTemplate
 from django.contrib.auth.decorators import login_required, user_passes_test
@@ -14,18 +14,17 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from church.views import get_user_organization
 from church.models import Department,Campus
 from member.models import Member
 from accounting.models import Voucher,VoucherAttachment,VoucherTemplate
 # ==================== MOBILE VOUCHER API VIEWS ====================
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_list_api_view(request):
     """Mobile API for listing vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -98,11 +97,11 @@ def voucher_list_api_view(request):
 
     
 @api_view(['GET', 'POST'])  # Allow both GET and POST
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_create_api_view(request):
     """Mobile API for creating vouchers - GET for form data, POST for creation."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -304,11 +303,11 @@ def voucher_create_api_view(request):
 
 # FIXED VERSION of voucher_detail_api_view
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_detail_api_view(request, voucher_id):
     """Mobile API for getting voucher details."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -441,11 +440,11 @@ def voucher_detail_api_view(request, voucher_id):
     return Response(data)
 
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_update_api_view(request, voucher_id):
     """Mobile API for updating vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -527,11 +526,11 @@ def voucher_update_api_view(request, voucher_id):
         )
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_delete_api_view(request, voucher_id):
     """Mobile API for deleting vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -570,11 +569,11 @@ def voucher_delete_api_view(request, voucher_id):
         )
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_submit_api_view(request, voucher_id):
     """Mobile API for submitting vouchers for approval."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -638,11 +637,11 @@ from decimal import Decimal, InvalidOperation
 from decimal import Decimal, InvalidOperation
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_approve_api_view(request, voucher_id):
     """Mobile API for approving vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -754,11 +753,11 @@ def voucher_approve_api_view(request, voucher_id):
         )
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_reject_api_view(request, voucher_id):
     """Mobile API for rejecting vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -819,11 +818,11 @@ def voucher_reject_api_view(request, voucher_id):
         )
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_pay_api_view(request, voucher_id):
     """Mobile API for marking vouchers as paid."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -896,11 +895,11 @@ def voucher_pay_api_view(request, voucher_id):
         )
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_dashboard_api_view(request):
     """Mobile API for voucher dashboard statistics."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -930,11 +929,11 @@ def voucher_dashboard_api_view(request):
     })
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_template_list_api_view(request):
     """Mobile API for listing voucher templates."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -970,11 +969,11 @@ def voucher_template_list_api_view(request):
 
 # Optional: Add comment and attachment endpoints
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_add_comment_api_view(request, voucher_id):
     """Mobile API for adding comments to vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1036,11 +1035,11 @@ from django.utils import timezone
 from decimal import Decimal
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_reports_api_view(request):
     """Mobile API for voucher reports and analytics - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1212,11 +1211,11 @@ from django.utils import timezone
 from decimal import Decimal
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def pending_approvals_report_view(request):
     """Report for vouchers pending approval - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -1309,11 +1308,11 @@ def pending_approvals_report_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def payment_status_report_view(request):
     """Report on payment status of vouchers - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -1426,11 +1425,11 @@ def payment_status_report_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def expense_trend_analysis_view(request):
     """Expense trend analysis over time - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -1550,11 +1549,11 @@ def expense_trend_analysis_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def overdue_vouchers_report_view(request):
     """Report on overdue vouchers - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -1679,11 +1678,11 @@ def overdue_vouchers_report_view(request):
 # In your church/views.py
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_notifications_api_view(request):
     """Mobile API for voucher notifications."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -1905,7 +1904,7 @@ def voucher_notifications_api_view(request):
     })
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def mark_notification_read_api_view(request, notification_id):
     """Mark a notification as read."""
@@ -1919,7 +1918,7 @@ def mark_notification_read_api_view(request, notification_id):
     })
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def mark_all_notifications_read_api_view(request):
     """Mark all notifications as read."""
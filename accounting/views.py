@@ -13,18 +13,6 @@ from django.views.decorators.http import require_http_methods
 # Add to your imports at the top
 from .models import Voucher, VoucherAttachment, VoucherComment
 
-# Helper function to get user's organization
-def get_user_organization(user):
-    if hasattr(user, 'organization') and user.organization:
-        return user.organization
-    # fallback if user belongs via profile or membership
-    if hasattr(user, 'profile') and hasattr(user.profile, 'organization'):
-        return user.profile.organization
-    return None
-
-
-
-
 def get_voucher_template(organization):
     """Get the default template for an organization."""
     try:
@@ -46,8 +34,7 @@ def get_voucher_template(organization):
 @login_required
 def voucher_list_view(request):
     """List vouchers - JSON for mobile, HTML for web."""
-    user = request.user
-    organization = get_user_organization(user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -150,7 +137,7 @@ def voucher_list_view(request):
 @login_required
 def voucher_template_list_view(request):
     """List all voucher templates for the organization."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return HttpResponseForbidden("No organization assigned")
@@ -167,7 +154,7 @@ def voucher_template_list_view(request):
 @require_http_methods(["GET", "POST"])
 def voucher_template_create_view(request):
     """Create a new voucher template."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         messages.error(request, "No organization assigned")
@@ -273,7 +260,7 @@ def voucher_template_edit_view(request, template_id):
 @login_required
 def voucher_template_edit_view(request, template_id):
     """Edit an existing voucher template."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     try:
         template = VoucherTemplate.objects.get(id=template_id, organization=organization)
     except VoucherTemplate.DoesNotExist:
@@ -385,7 +372,7 @@ def voucher_template_edit_view(request, template_id):
 @login_required
 def voucher_template_delete_view(request, template_id):
     """Delete a voucher template."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     try:
         template = VoucherTemplate.objects.get(id=template_id, organization=organization)
@@ -412,7 +399,7 @@ def voucher_template_delete_view(request, template_id):
 @login_required
 def voucher_template_duplicate_view(request, template_id):
     """Duplicate a voucher template."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     try:
         original = VoucherTemplate.objects.get(id=template_id, organization=organization)
@@ -449,7 +436,7 @@ def voucher_template_duplicate_view(request, template_id):
 @login_required
 def voucher_detail_view(request, voucher_id):
     """Single voucher - JSON for mobile, HTML for web."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -605,7 +592,7 @@ from .models import Voucher, VoucherTemplate, VoucherAttachment
 @require_http_methods(["GET", "POST"])
 def voucher_create_view(request):
     """Create voucher - handles both form POST and JSON POST."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -1317,7 +1304,7 @@ from datetime import timedelta
 @login_required
 def voucher_dashboard_view(request):
     """Voucher dashboard with statistics."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -1382,7 +1369,7 @@ def voucher_dashboard_view(request):
 @require_http_methods(["GET", "POST"])
 def voucher_create_blank_view(request, template_id=None):
     """Create a COMPLETELY blank voucher with NO pre-filled values."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return HttpResponseForbidden("No organization assigned")
@@ -1592,7 +1579,7 @@ from django.utils.text import slugify
 def voucher_pdf_view(request, voucher_id):
     """Render HTML template for PDF printing."""
     
-    organization = get_user_organization(request.user)
+    organization = request.organization
 
     if not organization:
         return HttpResponseForbidden("No organization assigned")
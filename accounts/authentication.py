@@ -0,0 +1,31 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class _UserModelWithOrganization:
+    """Stands in for the user model so JWTAuthentication's lookup joins the organization.
+
+    Everything except ``objects`` is forwarded to the real model, so the
+    upstream ``get_user`` checks (inactive users, revoked tokens) still apply.
+    """
+
+    def __init__(self, model):
+        self._model = model
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    @property
+    def objects(self):
+        return self._model._default_manager.select_related("organization")
+
+
+class OrganizationJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that loads the user's organization in the same query.
+
+    Nearly every API view reads ``request.organization`` right after
+    authentication, so joining it here saves one query per request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user_model = _UserModelWithOrganization(self.user_model)
@@ -2,10 +2,22 @@ import uuid
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from church.models import Organization
 
+# Role bits for User.role_mask, and the role sets allowed to act on church records.
+ROLE_STAFF = 1 << 0
+ROLE_OWNER = 1 << 1
+ROLE_ADMIN = 1 << 2
+ROLE_PASTOR = 1 << 3
+ROLE_HOD = 1 << 4
+
+CAN_DELETE = ROLE_STAFF | ROLE_OWNER | ROLE_ADMIN
+CAN_MANAGE = CAN_DELETE | ROLE_PASTOR
+CAN_MANAGE_INVENTORY = CAN_MANAGE | ROLE_HOD
+
 
 class UserManager(BaseUserManager):
     """Custom user manager where email is the unique identifier."""
@@ -83,6 +95,31 @@ class User(AbstractUser):
             levels.append("volunteer")
         return levels
 
+    @cached_property
+    def role_mask(self):
+        """The user's management roles packed into ROLE_* bits."""
+        return (
+            (ROLE_STAFF if self.is_staff else 0)
+            | (ROLE_OWNER if self.is_owner else 0)
+            | (ROLE_ADMIN if self.is_admin else 0)
+            | (ROLE_PASTOR if self.is_pastor else 0)
+            | (ROLE_HOD if self.is_hod else 0)
+        )
+
+    def has_roles(self, allowed):
+        """True if the user holds any of the roles in the ``allowed`` mask."""
+        return bool(self.role_mask & allowed)
+
+    @cached_property
+    def can_manage(self):
+        """Staff, owners, admins and pastors may create and edit church records."""
+        return self.has_roles(CAN_MANAGE)
+
+    @cached_property
+    def can_delete(self):
+        """Deleting church records is limited to staff, owners and admins."""
+        return self.has_roles(CAN_DELETE)
+
     def __str__(self):
         org = self.organization.slug if self.organization else "no-org"
         return f"{self.email} @ {org}"
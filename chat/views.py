@@ -14,7 +14,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 
 from member.models import Member
 from .models import Channel, ChannelMembership, DirectMessage, Message, ChatFile, ChannelJoinRequest
@@ -24,17 +24,6 @@ User = get_user_model()
 channel_layer = get_channel_layer()
 
 
-def get_user_organization(user):
-    if hasattr(user, 'organization') and user.organization:
-        return user.organization
-    
-    # fallback if user belongs via profile or membership
-    if hasattr(user, 'profile') and hasattr(user.profile, 'organization'):
-        return user.profile.organization
-    
-    return None
-
-
 def channel_group_name(channel_id):
     return f"chat.channel.{channel_id}"
 
@@ -94,7 +83,7 @@ def broadcast_message(thread_type, thread_id, msg_obj):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def chat_home_api_view(request):
     """
@@ -352,14 +341,14 @@ def chat_home_api_view(request):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def channel_create_api_view(request):
     """
     Create a new channel - FIXED VERSION
     """
     user = request.user
-    organization = get_user_organization(user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -462,7 +451,7 @@ def channel_create_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def channel_detail_api_view(request, channel_id):
     """Get channel details and messages"""
@@ -582,12 +571,12 @@ def channel_detail_api_view(request, channel_id):
 
 
 @api_view(["POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def channel_join_api_view(request, channel_id):
     """Join a channel (auto-join if public, otherwise create a join request)."""
     user = request.user
-    organization = get_user_organization(request.user)
+    organization = request.organization
     if not organization:
         return Response({"success": False, "error": "No organization assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -612,12 +601,12 @@ def channel_join_api_view(request, channel_id):
 
 
 @api_view(["POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def channel_leave_api_view(request, channel_id):
     """Leave a channel."""
     user = request.user
-    organization = get_user_organization(user)
+    organization = request.organization
     if not organization:
         return Response({"success": False, "error": "No organization assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -627,7 +616,7 @@ def channel_leave_api_view(request, channel_id):
 
 
 @api_view(["POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def channel_join_approve_api_view(request, request_id):
     """Approve a join request (channel creator/staff)."""
@@ -647,14 +636,14 @@ def channel_join_approve_api_view(request, request_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def send_channel_message_api_view(request, channel_id):
     """
     Send message to a channel
     """
     user = request.user
-    organization = get_user_organization(user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -758,7 +747,7 @@ def send_channel_message_api_view(request, channel_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def start_dm_api_view(request):
     """
@@ -793,7 +782,7 @@ def start_dm_api_view(request):
     
     # SIMPLE CHECK: Just check if target_user has the same organization
     # NO MEMBER PROFILE CHECK NEEDED!
-    if target_user.organization != organization:
+    if target_user.organization_id != organization.id:
         return Response(
             {'success': False, 'error': 'User is not in your organization'}, 
             status=status.HTTP_400_BAD_REQUEST
@@ -862,7 +851,7 @@ def start_dm_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def dm_detail_api_view(request, dm_id):
     """
@@ -1041,7 +1030,7 @@ def dm_detail_api_view(request, dm_id):
     })
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def send_dm_message_api_view(request, dm_id):
     """
@@ -1163,14 +1152,14 @@ def send_dm_message_api_view(request, dm_id):
         )
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def mark_messages_read_api_view(request):
     """
     Mark messages as read
     """
     user = request.user
-    organization = get_user_organization(user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1231,14 +1220,14 @@ def mark_messages_read_api_view(request):
 
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def delete_message_api_view(request, message_id):
     """
     Delete a message
     """
     user = request.user
-    organization = get_user_organization(user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -8,7 +8,7 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status, viewsets, filters
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
 from .serializers import MemberSerializer, DepartmentSerializer, FamilySerializer, CampusSerializer
 # Add these imports at the top of your views.py
@@ -19,18 +19,17 @@ import base64
 from django.core.paginator import Paginator
 from django.db.models import Q, Sum
 from django.core.files.base import ContentFile
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from .models import Member, Department, Family, Campus,Invitation, Organization, OrganizationSubscription, SubscriptionPlan
+from .views import format_date_for_model
 
 # ----- API VIEWS FOR MOBILE APP -----
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_list_api_view(request):
     """API endpoint for listing members with filtering and search."""
-    user = request.user
-    organization = get_user_organization(user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -96,12 +95,12 @@ def member_list_api_view(request):
         })
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_detail_api_view(request, member_id):
     """API endpoint for single member details."""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
@@ -118,75 +117,13 @@ def member_detail_api_view(request, member_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
-# church/views.py - Add this helper function and update the create view
-
-def format_date_for_model(date_value):
-    """Helper to convert various date formats to YYYY-MM-DD."""
-    if not date_value:
-        return None
-    
-    from datetime import datetime
-    
-    if isinstance(date_value, str):
-        # Try different date formats
-        formats = [
-            '%Y-%m-%d',  # 2024-01-15
-            '%d/%m/%Y',  # 15/01/2024
-            '%m/%d/%Y',  # 01/15/2024
-            '%Y-%m-%dT%H:%M:%S.%fZ',  # ISO format with time
-            '%Y-%m-%dT%H:%M:%S',      # ISO format without milliseconds
-        ]
-        
-        for fmt in formats:
-            try:
-                date_obj = datetime.strptime(date_value, fmt)
-                return date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-    
-    # If it's already a date object
-    if isinstance(date_value, datetime):
-        return date_value.strftime('%Y-%m-%d')
-    
-    return None
-
-# church/views.py - Add this helper function and update the create view
 
-def format_date_for_model(date_value):
-    """Helper to convert various date formats to YYYY-MM-DD."""
-    if not date_value:
-        return None
-    
-    from datetime import datetime
-    
-    if isinstance(date_value, str):
-        # Try different date formats
-        formats = [
-            '%Y-%m-%d',  # 2024-01-15
-            '%d/%m/%Y',  # 15/01/2024
-            '%m/%d/%Y',  # 01/15/2024
-            '%Y-%m-%dT%H:%M:%S.%fZ',  # ISO format with time
-            '%Y-%m-%dT%H:%M:%S',      # ISO format without milliseconds
-        ]
-        
-        for fmt in formats:
-            try:
-                date_obj = datetime.strptime(date_value, fmt)
-                return date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-    
-    # If it's already a date object
-    if isinstance(date_value, datetime):
-        return date_value.strftime('%Y-%m-%d')
-    
-    return None
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_create_api_view(request):
     
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -281,12 +218,12 @@ def member_create_api_view(request):
     )
 
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_update_api_view(request, member_id):
     """API endpoint for updating a member."""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
@@ -392,12 +329,12 @@ def member_update_api_view(request, member_id):
         )
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_delete_api_view(request, member_id):
     """API endpoint for deleting a member."""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
@@ -462,11 +399,11 @@ def member_delete_api_view(request, member_id):
         )
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_statistics_api_view(request):
     """API endpoint for member statistics."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -490,69 +427,17 @@ def member_statistics_api_view(request):
     
     return Response(stats)
 
-@api_view(['GET'])
-@authentication_classes([JWTAuthentication])
-@permission_classes([IsAuthenticated])
-def department_list_api_view(request):
-    """API endpoint for listing departments."""
-    organization = get_user_organization(request.user)
-    
-    if not organization:
-        return Response(
-            {'error': 'No organization assigned'}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    departments = Department.objects.filter(organization=organization)
-    serializer = DepartmentSerializer(departments, many=True, context={'request': request})
-    return Response({'departments': serializer.data})
-
-@api_view(['GET'])
-@authentication_classes([JWTAuthentication])
-@permission_classes([IsAuthenticated])
-def family_list_api_view(request):
-    """API endpoint for listing families."""
-    organization = get_user_organization(request.user)
-    
-    if not organization:
-        return Response(
-            {'error': 'No organization assigned'}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    families = Family.objects.filter(organization=organization)
-    serializer = FamilySerializer(families, many=True, context={'request': request})
-    return Response({'families': serializer.data})
-
-@api_view(['GET'])
-@authentication_classes([JWTAuthentication])
-@permission_classes([IsAuthenticated])
-def campus_list_api_view(request):
-    """API endpoint for listing campuses."""
-    organization = get_user_organization(request.user)
-    
-    if not organization:
-        return Response(
-            {'error': 'No organization assigned'}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    campuses = Campus.objects.filter(organization=organization)
-    serializer = CampusSerializer(campuses, many=True, context={'request': request})
-    return Response({'campuses': serializer.data})
-
-
 # church/views.py - Add these API views
 
 
 # Add to your church/views.py
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def department_list_api_view(request):
     """API endpoint for listing departments."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -570,11 +455,11 @@ def department_list_api_view(request):
     })
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def campus_list_api_view(request):
     """API endpoint for listing campuses."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -592,11 +477,11 @@ def campus_list_api_view(request):
     })
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def family_list_api_view(request):
     """API endpoint for listing families."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -615,11 +500,11 @@ def family_list_api_view(request):
 
 # ✅ Department create view - CORRECT
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def department_create_api_view(request):
     """API endpoint for creating a department."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -664,11 +549,11 @@ def department_create_api_view(request):
 
 # ✅ Department update view - CORRECT
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def department_update_api_view(request, department_id):
     """API endpoint for updating a department."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -736,11 +621,11 @@ def department_update_api_view(request, department_id):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def department_detail_api_view(request, department_id):
     """API endpoint for getting a single department."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -765,11 +650,11 @@ def department_detail_api_view(request, department_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def department_add_members_api_view(request, department_id):
     """Add members to a department."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -815,11 +700,11 @@ def department_add_members_api_view(request, department_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def department_remove_members_api_view(request, department_id):
     """Remove members from a department."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -866,11 +751,11 @@ def department_remove_members_api_view(request, department_id):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def department_members_api_view(request, department_id):
     """Get all members in a department."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -902,11 +787,11 @@ def department_members_api_view(request, department_id):
 
 # ✅ Department delete view - CORRECT
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def department_delete_api_view(request, department_id):
     """API endpoint for deleting a department."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -952,11 +837,11 @@ def department_delete_api_view(request, department_id):
     )
 # 🔧 FIXED Campus create view
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def campus_create_api_view(request):
     """API endpoint for creating a campus."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1006,11 +891,11 @@ def campus_create_api_view(request):
 
 # Campus member management views
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def campus_members_api_view(request, campus_id):
     """Get all members in a campus."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1040,11 +925,11 @@ def campus_members_api_view(request, campus_id):
     })
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def campus_add_members_api_view(request, campus_id):
     """Add members to a campus."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1091,11 +976,11 @@ def campus_add_members_api_view(request, campus_id):
 
 # 🔧 FIXED Family create view
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def family_create_api_view(request):
     """API endpoint for creating a family."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1143,11 +1028,11 @@ def family_create_api_view(request):
 # ✅ Add these for completeness
 
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def campus_update_api_view(request, campus_id):
     """API endpoint for updating a campus."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1201,11 +1086,11 @@ def campus_update_api_view(request, campus_id):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def campus_delete_api_view(request, campus_id):
     """API endpoint for deleting a campus."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1247,11 +1132,11 @@ def campus_delete_api_view(request, campus_id):
     )
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def campus_detail_api_view(request, campus_id):
     """API endpoint for getting a single campus."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1273,11 +1158,11 @@ def campus_detail_api_view(request, campus_id):
         )
 
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def family_update_api_view(request, family_id):
     """API endpoint for updating a family."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1332,11 +1217,11 @@ def family_update_api_view(request, family_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def campus_remove_members_api_view(request, campus_id):
     """Remove members from a campus."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1382,11 +1267,11 @@ def campus_remove_members_api_view(request, campus_id):
     })
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def family_delete_api_view(request, family_id):
     """API endpoint for deleting a family."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1428,11 +1313,11 @@ def family_delete_api_view(request, family_id):
     )
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def family_detail_api_view(request, family_id):
     """API endpoint for getting a single family."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1455,11 +1340,11 @@ def family_detail_api_view(request, family_id):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def family_members_api_view(request, family_id):
     """Get all members in a family."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1491,11 +1376,11 @@ def family_members_api_view(request, family_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def family_add_members_api_view(request, family_id):
     """Add members to a family."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1540,11 +1425,11 @@ def family_add_members_api_view(request, family_id):
     })
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def family_remove_members_api_view(request, family_id):
     """Remove members from a family."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1594,11 +1479,11 @@ def family_remove_members_api_view(request, family_id):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_list_api_view(request):
     """Mobile API for listing vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1672,11 +1557,11 @@ def voucher_list_api_view(request):
 
     
 @api_view(['GET', 'POST'])  # Allow both GET and POST
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_create_api_view(request):
     """Mobile API for creating vouchers - GET for form data, POST for creation."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -1878,11 +1763,11 @@ def voucher_create_api_view(request):
 
 # FIXED VERSION of voucher_detail_api_view
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_detail_api_view(request, voucher_id):
     """Mobile API for getting voucher details."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2016,11 +1901,11 @@ def voucher_detail_api_view(request, voucher_id):
     return Response(data)
 
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_update_api_view(request, voucher_id):
     """Mobile API for updating vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2102,11 +1987,11 @@ def voucher_update_api_view(request, voucher_id):
         )
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_delete_api_view(request, voucher_id):
     """Mobile API for deleting vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2145,11 +2030,11 @@ def voucher_delete_api_view(request, voucher_id):
         )
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_submit_api_view(request, voucher_id):
     """Mobile API for submitting vouchers for approval."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2213,11 +2098,11 @@ from decimal import Decimal, InvalidOperation
 from decimal import Decimal, InvalidOperation
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_approve_api_view(request, voucher_id):
     """Mobile API for approving vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2329,11 +2214,11 @@ def voucher_approve_api_view(request, voucher_id):
         )
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_reject_api_view(request, voucher_id):
     """Mobile API for rejecting vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2394,11 +2279,11 @@ def voucher_reject_api_view(request, voucher_id):
         )
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_pay_api_view(request, voucher_id):
     """Mobile API for marking vouchers as paid."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2471,11 +2356,11 @@ def voucher_pay_api_view(request, voucher_id):
         )
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_dashboard_api_view(request):
     """Mobile API for voucher dashboard statistics."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2505,11 +2390,11 @@ def voucher_dashboard_api_view(request):
     })
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_template_list_api_view(request):
     """Mobile API for listing voucher templates."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2545,11 +2430,11 @@ def voucher_template_list_api_view(request):
 
 # Optional: Add comment and attachment endpoints
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_add_comment_api_view(request, voucher_id):
     """Mobile API for adding comments to vouchers."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2611,11 +2496,11 @@ from django.utils import timezone
 from decimal import Decimal
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_reports_api_view(request):
     """Mobile API for voucher reports and analytics - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -2787,11 +2672,11 @@ from django.utils import timezone
 from decimal import Decimal
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def pending_approvals_report_view(request):
     """Report for vouchers pending approval - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -2884,11 +2769,11 @@ def pending_approvals_report_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def payment_status_report_view(request):
     """Report on payment status of vouchers - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -3001,11 +2886,11 @@ def payment_status_report_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def expense_trend_analysis_view(request):
     """Expense trend analysis over time - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -3125,11 +3010,11 @@ def expense_trend_analysis_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def overdue_vouchers_report_view(request):
     """Report on overdue vouchers - FIXED VERSION."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -3254,11 +3139,11 @@ def overdue_vouchers_report_view(request):
 # In your church/views.py
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def voucher_notifications_api_view(request):
     """Mobile API for voucher notifications."""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response({'error': 'No organization assigned'}, status=400)
@@ -3480,7 +3365,7 @@ def voucher_notifications_api_view(request):
     })
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def mark_notification_read_api_view(request, notification_id):
     """Mark a notification as read."""
@@ -3494,7 +3379,7 @@ def mark_notification_read_api_view(request, notification_id):
     })
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def mark_all_notifications_read_api_view(request):
     """Mark all notifications as read."""
@@ -3516,7 +3401,7 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status, viewsets, filters
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
 from django.core.paginator import Paginator
 from django.db.models import Q, Sum, F
@@ -3532,23 +3417,13 @@ from .serializers import (
 )
 
 
-def get_user_organization(user):
-    """Helper to get user's organization"""
-    if hasattr(user, 'organization') and user.organization:
-        return user.organization
-    
-    if hasattr(user, 'profile') and hasattr(user.profile, 'organization'):
-        return user.profile.organization
-    
-    return None
-
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_dashboard_api_view(request):
     """API endpoint for inventory dashboard"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -3581,11 +3456,11 @@ def inventory_dashboard_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_list_api_view(request):
     """API endpoint for listing inventory items with filtering"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -3653,12 +3528,12 @@ def inventory_item_list_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_detail_api_view(request, item_id):
     """API endpoint for single inventory item details"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
@@ -3677,11 +3552,11 @@ def inventory_item_detail_api_view(request, item_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_create_api_view(request):
     """API endpoint for creating inventory items"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -3726,12 +3601,12 @@ def inventory_item_create_api_view(request):
 
 
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_update_api_view(request, item_id):
     """API endpoint for updating inventory items"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
@@ -3786,12 +3661,12 @@ def inventory_item_update_api_view(request, item_id):
 
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_delete_api_view(request, item_id):
     """API endpoint for deleting inventory items"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
@@ -3818,7 +3693,7 @@ def inventory_item_delete_api_view(request, item_id):
         # Check if item has active checkouts
         active_checkouts = InventoryCheckout.objects.filter(
             item=item,
-            status__in=['active', 'overdue']
+            status__in=InventoryCheckout.ACTIVE_STATUSES
         ).exists()
         
         if active_checkouts:
@@ -3843,11 +3718,11 @@ def inventory_item_delete_api_view(request, item_id):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_checkout_list_api_view(request):
     """API endpoint for listing inventory checkouts"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -3901,11 +3776,11 @@ def inventory_checkout_list_api_view(request):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_checkout_create_api_view(request):
     """API endpoint for creating checkouts"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -3991,7 +3866,7 @@ def inventory_checkout_create_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_low_stock_alerts_api_view(request):
     """
@@ -4006,8 +3881,7 @@ def inventory_low_stock_alerts_api_view(request):
     - sort: Sort by field (quantity, name, last_checked_out, etc.)
     """
     try:
-        user = request.user
-        organization = get_user_organization(user)
+        organization = request.organization
         
         if not organization:
             return Response(
@@ -4150,7 +4024,7 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 from django.db.models import Q, F
 from django.utils import timezone
 
@@ -4164,24 +4038,14 @@ from .serializers import (
 )
 
 
-def get_user_organization(user):
-    """Helper to get user's organization"""
-    if hasattr(user, 'organization') and user.organization:
-        return user.organization
-    
-    if hasattr(user, 'profile') and hasattr(user.profile, 'organization'):
-        return user.profile.organization
-    
-    return None
-
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_category_list_api_view(request):
     """API endpoint for listing inventory categories"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         
         if not organization:
             return Response(
@@ -4224,12 +4088,12 @@ def inventory_category_list_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_vendor_list_api_view(request):
     """API endpoint for listing inventory vendors"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         
         if not organization:
             return Response(
@@ -4276,12 +4140,12 @@ def inventory_vendor_list_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_transaction_list_api_view(request):
     """API endpoint for listing inventory transactions"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         
         if not organization:
             return Response(
@@ -4356,12 +4220,12 @@ def inventory_transaction_list_api_view(request):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def stock_adjustment_api_view(request):
     """API endpoint for adjusting stock"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         
         if not organization:
             return Response(
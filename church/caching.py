@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from django.db import transaction
+
+# Plans change rarely; keep the catalog in the cache and drop it on every plan write.
+ACTIVE_PLANS_CACHE_KEY = "active_subscription_plans"
+ALL_PLANS_CACHE_KEY = "subscription_plans"
+PLANS_CACHE_TIMEOUT = 300
+
+# Per-organization list payloads for the mobile list endpoints and the
+# inventory item form's dropdowns.
+ORG_LIST_CACHE_TIMEOUT = 600
+ORG_LIST_KINDS = ("departments", "campuses", "inventory_choices")
+
+
+def org_list_cache_key(kind, organization_id):
+    return f"{kind}:list:{organization_id}"
+
+
+def invalidate_org_list_cache(organization_id, *kinds):
+    """Drop cached list payloads for an organization (all kinds when none given).
+
+    The delete waits for the surrounding transaction to commit, so a read that
+    runs before the commit can't re-cache the rows as they were before the write.
+    """
+    if not organization_id:
+        return
+    keys = [org_list_cache_key(kind, organization_id) for kind in kinds or ORG_LIST_KINDS]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_subscription_plan_cache():
+    """Drop the cached plan catalog once the surrounding transaction commits."""
+    transaction.on_commit(lambda: cache.delete_many([ACTIVE_PLANS_CACHE_KEY, ALL_PLANS_CACHE_KEY]))
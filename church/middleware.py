@@ -0,0 +1,19 @@
+from django.utils.functional import SimpleLazyObject
+
+from .utils import get_user_organization
+
+
+class OrganizationMiddleware:
+    """Expose the current user's organization as ``request.organization``.
+
+    Resolution is lazy: DRF authenticates JWT requests after middleware has run
+    and then sets the user on the underlying request, so the organization is
+    looked up on first access from the view rather than here.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.organization = SimpleLazyObject(lambda: get_user_organization(request.user))
+        return self.get_response(request)
@@ -329,3 +329,8 @@ class MemberSerializer(serializers.ModelSerializer):
     
     def get_full_name(self, obj):
         return obj.full_name
+
+
+class MemberIdsSerializer(serializers.Serializer):
+    """Body of the add/remove members endpoints: ``{"member_ids": [...]}``."""
+    member_ids = serializers.ListField(child=serializers.UUIDField(), default=list)
@@ -0,0 +1,41 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from inventory.models import InventoryCategory, InventoryVendor
+
+from .caching import invalidate_org_list_cache, invalidate_subscription_plan_cache
+from .models import Campus, Department, Member, SubscriptionPlan
+
+
+@receiver([post_save, post_delete], sender=Department)
+def department_changed(sender, instance, **kwargs):
+    invalidate_org_list_cache(instance.organization_id, "departments", "inventory_choices")
+
+
+@receiver([post_save, post_delete], sender=Campus)
+def campus_changed(sender, instance, **kwargs):
+    invalidate_org_list_cache(instance.organization_id, "campuses")
+
+
+@receiver([post_save, post_delete], sender=InventoryCategory)
+@receiver([post_save, post_delete], sender=InventoryVendor)
+def inventory_choice_changed(sender, instance, **kwargs):
+    invalidate_org_list_cache(instance.organization_id, "inventory_choices")
+
+
+@receiver([post_save, post_delete], sender=Member)
+def member_changed(sender, instance, **kwargs):
+    # Department lists carry member counts.
+    invalidate_org_list_cache(instance.organization_id, "departments")
+
+
+@receiver(m2m_changed, sender=Member.departments.through)
+def member_departments_changed(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        invalidate_org_list_cache(instance.organization_id, "departments")
+
+
+@receiver([post_save, post_delete], sender=SubscriptionPlan)
+def subscription_plan_changed(sender, instance, **kwargs):
+    # Covers the admin as well as the plan views.
+    invalidate_subscription_plan_cache()
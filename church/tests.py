@@ -0,0 +1,139 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from inventory.models import InventoryCategory, InventoryVendor
+from inventory.views import get_inventory_form_choices
+
+from .models import Campus, Department, Family, Member, Organization, SubscriptionPlan
+from .views import get_active_subscription_plans
+
+
+class OrgListCacheInvalidationTests(TestCase):
+    """The cached department/campus lists must drop stale rows after every kind of write."""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(name="Grace Chapel", slug="grace-chapel")
+        self.user = User.objects.create_user(
+            email="admin@grace.test", password="secret", organization=self.organization, is_admin=True
+        )
+        self.member = Member.objects.create(
+            organization=self.organization, first_name="Ada", last_name="Obi", email="ada@grace.test"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_list(self, url_name, kind):
+        response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        return response.json()[kind]
+
+    def department_member_count(self, department):
+        rows = self.get_list("api_department_list", "departments")
+        return next(row["member_count"] for row in rows if row["id"] == str(department.id))
+
+    def test_department_save_and_delete_signals_drop_cached_list(self):
+        self.assertEqual(self.get_list("api_department_list", "departments"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            department = Department.objects.create(organization=self.organization, name="Choir")
+        self.assertEqual(
+            [row["name"] for row in self.get_list("api_department_list", "departments")], ["Choir"]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            department.delete()
+        self.assertEqual(self.get_list("api_department_list", "departments"), [])
+
+    def test_campus_save_signal_drops_cached_list(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            campus = Campus.objects.create(organization=self.organization, name="North")
+        self.assertEqual([row["name"] for row in self.get_list("api_campus_list", "campuses")], ["North"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            campus.name = "North Campus"
+            campus.save()
+        self.assertEqual(
+            [row["name"] for row in self.get_list("api_campus_list", "campuses")], ["North Campus"]
+        )
+
+    def test_member_m2m_signal_refreshes_member_count(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            department = Department.objects.create(organization=self.organization, name="Ushers")
+        self.assertEqual(self.department_member_count(department), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.member.departments.add(department)
+        self.assertEqual(self.department_member_count(department), 1)
+
+    def test_through_table_bulk_create_and_delete_refresh_member_count(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            department = Department.objects.create(organization=self.organization, name="Media")
+        self.assertEqual(self.department_member_count(department), 0)
+
+        body = {"member_ids": [str(self.member.id)]}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("api_department_add_members", args=[department.id]), body, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.department_member_count(department), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("api_department_remove_members", args=[department.id]), body, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.department_member_count(department), 0)
+
+    def test_family_list_reflects_queryset_update(self):
+        # Family lists are not cached, so the bulk UPDATE behind add-members
+        # shows up without any invalidation.
+        family = Family.objects.create(organization=self.organization, family_name="Obi")
+        self.assertEqual(self.get_list("api_family_list", "families")[0]["members"], [])
+
+        response = self.client.post(
+            reverse("api_family_add_members", args=[family.id]),
+            {"member_ids": [str(self.member.id)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        members = self.get_list("api_family_list", "families")[0]["members"]
+        self.assertEqual([row["id"] for row in members], [str(self.member.id)])
+
+    def test_inventory_form_choices_follow_category_vendor_and_department_writes(self):
+        self.assertEqual(get_inventory_form_choices(self.organization), ([], [], []))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            InventoryCategory.objects.create(organization=self.organization, name="Audio")
+            InventoryVendor.objects.create(organization=self.organization, name="Sound Co")
+            department = Department.objects.create(organization=self.organization, name="Tech")
+        categories, departments, vendors = get_inventory_form_choices(self.organization)
+        self.assertEqual([row["name"] for row in categories], ["Audio"])
+        self.assertEqual([row["name"] for row in departments], ["Tech"])
+        self.assertEqual([row["name"] for row in vendors], ["Sound Co"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            department.delete()
+        self.assertEqual(get_inventory_form_choices(self.organization)[1], [])
+
+
+class SubscriptionPlanCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_plan_writes_outside_the_views_drop_the_cached_catalog(self):
+        # e.g. edits made through the Django admin
+        self.assertEqual(get_active_subscription_plans(), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            plan = SubscriptionPlan.objects.create(name="Starter", slug="starter")
+        self.assertEqual(get_active_subscription_plans(), [plan])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            plan.is_active = False
+            plan.save()
+        self.assertEqual(get_active_subscription_plans(), [])
@@ -1,9 +1,41 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from django.core.mail import send_mail
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
 from django.urls import reverse
 
+try:
+    import orjson  # Optional: faster JSON encoding (pip install orjson)
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+# Invitation emails go out on a small background pool so the SMTP round trip
+# never holds up the response that created the invitation.
+_email_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="invitation-email")
+
+
+def _send_mail_quietly(**kwargs):
+    try:
+        send_mail(**kwargs)
+    except Exception:
+        # The invitation is already committed; log the failure so it can be resent.
+        logger.exception("Failed to send invitation email to %s", kwargs.get("recipient_list"))
+
 
 def send_invitation_email(invitation, request=None):
-    """Send an invitation email with the acceptance link and token."""
+    """Queue an invitation email with the acceptance link and token.
+
+    The message is built here, while the request and invitation are at hand;
+    the SMTP send runs on a worker thread once the current transaction commits.
+    """
     accept_path = reverse("accept_invite")
     accept_url = (
         request.build_absolute_uri(f"{accept_path}?token={invitation.token}")
@@ -16,23 +48,75 @@ def send_invitation_email(invitation, request=None):
         f"Use this link to accept: {accept_url}\n"
         f"Or use the token directly: {invitation.token}\n"
     )
+    send = partial(
+        _send_mail_quietly,
+        subject=subject,
+        message=message,
+        from_email=None,
+        recipient_list=[invitation.email],
+    )
+    transaction.on_commit(lambda: _email_executor.submit(send))
+
+
+def fast_json_response(payload, status=200):
+    """JSON response encoded with orjson when available, JsonResponse otherwise.
+
+    Callers can pass .values() rows straight through. orjson hands dates, times
+    and anything it can't encode to DjangoJSONEncoder, so the output is the same
+    whether or not orjson is installed.
+    """
+    if orjson is None:
+        return JsonResponse(payload, status=status)
+    return HttpResponse(
+        orjson.dumps(payload, default=DjangoJSONEncoder().default, option=orjson.OPT_PASSTHROUGH_DATETIME),
+        status=status,
+        content_type="application/json",
+    )
+
+
+def loads_json(body):
+    """Decode a JSON request body with orjson when available, json otherwise.
+
+    orjson's decode error subclasses json.JSONDecodeError, so callers catch the same exception.
+    """
+    if orjson is None:
+        return json.loads(body)
+    return orjson.loads(body)
+
+
+def parse_bool(value):
+    """Read a submitted flag: JSON booleans pass through, form strings like "false" or "0" are False."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "on", "yes")
+    return bool(value)
+
+
+def get_user_organization(user):
+    """Resolve the user's organization, memoized on the user for the request.
+
+    request.user is the same instance for the whole request, so every view and
+    helper that asks again gets the first result without re-walking relations.
+    OrganizationMiddleware exposes the result as ``request.organization``.
+    """
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=None,
-            recipient_list=[invitation.email],
-            fail_silently=True,
-        )
-    except Exception:
-        # Ignore email failures to keep invitation creation non-blocking.
+        return user._organization_cache
+    except AttributeError:
         pass
 
+    organization = None
+    # Check the FK column first so users without an org never touch the relation
+    if getattr(user, "organization_id", None):
+        organization = user.organization
+    # fallback if user belongs via profile or membership
+    elif hasattr(user, "profile") and hasattr(user.profile, "organization"):
+        organization = user.profile.organization
+
+    user._organization_cache = organization
+    return organization
 
 
 # utils.py - Replace your render_to_pdf function
 from io import BytesIO
-from django.http import HttpResponse
 from django.template.loader import get_template
 from django.conf import settings
 import os
@@ -4,7 +4,7 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status, viewsets, filters
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
 from django.core.paginator import Paginator
 from django.db.models import Q, Sum, F
@@ -20,23 +20,12 @@ from .serializers import (
 )
 
 
-def get_user_organization(user):
-    """Helper to get user's organization"""
-    if hasattr(user, 'organization') and user.organization:
-        return user.organization
-    
-    if hasattr(user, 'profile') and hasattr(user.profile, 'organization'):
-        return user.profile.organization
-    
-    return None
-
-
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_dashboard_api_view(request):
     """API endpoint for inventory dashboard"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -69,11 +58,11 @@ def inventory_dashboard_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_list_api_view(request):
     """API endpoint for listing inventory items with filtering"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -141,12 +130,12 @@ def inventory_item_list_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_detail_api_view(request, item_id):
     """API endpoint for single inventory item details"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
@@ -165,11 +154,11 @@ def inventory_item_detail_api_view(request, item_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_create_api_view(request):
     """API endpoint for creating inventory items"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -179,12 +168,7 @@ def inventory_item_create_api_view(request):
     
     # Check permissions
     user = request.user
-    can_manage = (
-        user.is_staff or 
-        getattr(user, "is_owner", False) or 
-        getattr(user, "is_admin", False) or 
-        getattr(user, "is_pastor", False)
-    )
+    can_manage = user.can_manage
     
     if not can_manage:
         return Response(
@@ -205,7 +189,7 @@ def inventory_item_create_api_view(request):
                 'success': True,
                 'message': 'Item created successfully',
                 'item_id': str(item.id),
-                'item': InventoryItemSerializer(item, context={'request': request}).data
+                'item': serializer.data
             },
             status=status.HTTP_201_CREATED
         )
@@ -214,35 +198,27 @@ def inventory_item_create_api_view(request):
 
 
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_update_api_view(request, item_id):
     """API endpoint for updating inventory items"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        item = InventoryItem.objects.get(id=item_id, organization=organization)
-        
         # Check permissions
-        user = request.user
-        can_manage = (
-            user.is_staff or 
-            getattr(user, "is_owner", False) or 
-            getattr(user, "is_admin", False) or 
-            getattr(user, "is_pastor", False)
-        )
-        
-        if not can_manage:
+        if not request.user.can_manage:
             return Response(
                 {'error': 'Permission denied'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        item = InventoryItem.objects.get(id=item_id, organization=organization)
+        
         # Prepare the data
         data = request.data.copy()
         data['organization'] = str(organization.id)
@@ -274,39 +250,31 @@ def inventory_item_update_api_view(request, item_id):
 
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_item_delete_api_view(request, item_id):
     """API endpoint for deleting inventory items"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        item = InventoryItem.objects.get(id=item_id, organization=organization)
-        
         # Check permissions
-        user = request.user
-        can_manage = (
-            user.is_staff or 
-            getattr(user, "is_owner", False) or 
-            getattr(user, "is_admin", False) or 
-            getattr(user, "is_pastor", False)
-        )
-        
-        if not can_manage:
+        if not request.user.can_manage:
             return Response(
                 {'error': 'Permission denied'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        item = InventoryItem.objects.get(id=item_id, organization=organization)
+        
         # Check if item has active checkouts
         active_checkouts = InventoryCheckout.objects.filter(
             item=item,
-            status__in=['active', 'overdue']
+            status__in=InventoryCheckout.ACTIVE_STATUSES
         ).exists()
         
         if active_checkouts:
@@ -331,11 +299,11 @@ def inventory_item_delete_api_view(request, item_id):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_checkout_list_api_view(request):
     """API endpoint for listing inventory checkouts"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -389,11 +357,11 @@ def inventory_checkout_list_api_view(request):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_checkout_create_api_view(request):
     """API endpoint for creating checkouts"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -403,12 +371,7 @@ def inventory_checkout_create_api_view(request):
     
     # Check permissions
     user = request.user
-    can_checkout = (
-        user.is_staff or 
-        getattr(user, "is_owner", False) or 
-        getattr(user, "is_admin", False) or 
-        getattr(user, "is_pastor", False)
-    )
+    can_checkout = user.can_manage
     
     if not can_checkout:
         return Response(
@@ -469,7 +432,7 @@ def inventory_checkout_create_api_view(request):
         return Response({
             'success': True,
             'message': 'Item checked out successfully',
-            'checkout': InventoryCheckoutSerializer(checkout, context={'request': request}).data
+            'checkout': serializer.data
         }, status=status.HTTP_201_CREATED)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -479,7 +442,7 @@ def inventory_checkout_create_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_low_stock_alerts_api_view(request):
     """
@@ -494,8 +457,7 @@ def inventory_low_stock_alerts_api_view(request):
     - sort: Sort by field (quantity, name, last_checked_out, etc.)
     """
     try:
-        user = request.user
-        organization = get_user_organization(user)
+        organization = request.organization
         
         if not organization:
             return Response(
@@ -639,7 +601,7 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 from django.db.models import Q, F
 from django.utils import timezone
 
@@ -653,24 +615,13 @@ from .serializers import (
 )
 
 
-def get_user_organization(user):
-    """Helper to get user's organization"""
-    if hasattr(user, 'organization') and user.organization:
-        return user.organization
-    
-    if hasattr(user, 'profile') and hasattr(user.profile, 'organization'):
-        return user.profile.organization
-    
-    return None
-
-
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_category_list_api_view(request):
     """API endpoint for listing inventory categories"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         
         if not organization:
             return Response(
@@ -713,12 +664,12 @@ def inventory_category_list_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_vendor_list_api_view(request):
     """API endpoint for listing inventory vendors"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         
         if not organization:
             return Response(
@@ -765,12 +716,12 @@ def inventory_vendor_list_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def inventory_transaction_list_api_view(request):
     """API endpoint for listing inventory transactions"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         
         if not organization:
             return Response(
@@ -845,12 +796,12 @@ def inventory_transaction_list_api_view(request):
         
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def stock_adjustment_api_view(request):
     """API endpoint for adjusting stock"""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         
         if not organization:
             return Response(
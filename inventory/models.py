@@ -266,6 +266,8 @@ class InventoryCheckout(models.Model):
         ("lost", "Lost"),
         ("damaged", "Damaged"),
     ]
+    # Statuses for which the item is still out
+    ACTIVE_STATUSES = ("active", "overdue")
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     organization = models.ForeignKey("church.Organization", on_delete=models.CASCADE, related_name="inventory_checkouts")
@@ -303,6 +305,7 @@ class InventoryCheckout(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["due_date"]),
             models.Index(fields=["member", "status"]),
+            models.Index(fields=["item", "status"]),
         ]
 
     def __str__(self):
@@ -199,12 +199,7 @@ class InventoryTransactionSerializer(serializers.ModelSerializer):
             
             # Auto-approve if user has permission
             user = request.user
-            can_approve = (
-                user.is_staff or 
-                getattr(user, "is_owner", False) or 
-                getattr(user, "is_admin", False) or 
-                getattr(user, "is_pastor", False)
-            )
+            can_approve = user.can_manage
             if can_approve:
                 validated_data['approved_by'] = request.user
                 validated_data['approved_at'] = timezone.now()
@@ -270,12 +265,7 @@ class InventoryCheckoutSerializer(serializers.ModelSerializer):
             
             # Auto-approve if user has permission
             user = request.user
-            can_approve = (
-                user.is_staff or 
-                getattr(user, "is_owner", False) or 
-                getattr(user, "is_admin", False) or 
-                getattr(user, "is_pastor", False)
-            )
+            can_approve = user.can_manage
             if can_approve:
                 validated_data['approved_by'] = request.user
                 validated_data['approved_at'] = timezone.now()
@@ -1,15 +1,19 @@
 # inventory/views.py
-import json
-from datetime import datetime
+from datetime import date, datetime
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Q, Sum, F, Count
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, ProtectedError, Q, Sum
 from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, HttpResponseNotFound
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
-from church.views import get_user_organization
+from accounts.models import CAN_MANAGE_INVENTORY
+from church.caching import ORG_LIST_CACHE_TIMEOUT, org_list_cache_key
+from church.models import Department
+from church.utils import loads_json, parse_bool
 
 from .models import (
     InventoryCategory, InventoryVendor, InventoryItem, 
@@ -17,12 +21,60 @@ from .models import (
     InventoryAuditItem
 )
 
+# Columns inventory_item_update_view may change; updated_at must be listed for auto_now.
+INVENTORY_ITEM_EDIT_FIELDS = [
+    'name', 'description', 'sku', 'barcode', 'asset_tag',
+    'quantity', 'reorder_level', 'reorder_quantity', 'alert_on_low',
+    'location', 'condition', 'item_type', 'storage_instructions',
+    'purchase_price', 'notes', 'category', 'department', 'vendor',
+    'purchase_date', 'warranty_expiry', 'image', 'updated_at',
+]
+# Integer form fields and the labels used in their validation errors
+NUMERIC_FIELDS = {
+    'quantity': 'Quantity',
+    'reorder_level': 'Reorder Level',
+    'reorder_quantity': 'Reorder Quantity',
+}
+# Item foreign keys set from the form, with the model their ids must belong to
+INVENTORY_ITEM_RELATIONS = (
+    ('category', InventoryCategory),
+    ('department', Department),
+    ('vendor', InventoryVendor),
+)
+
+
+def parse_form_date(value):
+    """Parse a YYYY-MM-DD value; raises ValueError when it isn't one.
+
+    date.fromisoformat handles the zero-padded dates browsers send. Unpadded
+    ones such as 2024-1-5 fall back to strptime, which has always accepted them.
+    """
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def get_inventory_form_choices(organization):
+    """(categories, departments, vendors) id/name rows for the item form dropdowns.
+
+    Cached per organization and dropped by the category/department/vendor signals.
+    """
+    def load():
+        return tuple(
+            list(model.objects.filter(organization=organization).order_by('name').values('id', 'name'))
+            for _, model in INVENTORY_ITEM_RELATIONS
+        )
+
+    return cache.get_or_set(
+        org_list_cache_key('inventory_choices', organization.id), load, ORG_LIST_CACHE_TIMEOUT
+    )
 
 
 @login_required
 def inventory_dashboard_view(request):
     """Inventory dashboard - JSON for mobile, HTML for web"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -103,7 +155,7 @@ def inventory_dashboard_view(request):
 @login_required
 def inventory_item_list_view(request):
     """List inventory items - JSON for mobile, HTML for web"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -193,7 +245,7 @@ def inventory_item_list_view(request):
 @login_required
 def inventory_item_detail_view(request, item_id):
     """Single inventory item - JSON for mobile, HTML for web"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -275,7 +327,7 @@ def inventory_item_detail_view(request, item_id):
                     'due_date': c.due_date.isoformat() if c.due_date else None,
                     'status': c.status,
                 }
-                for c in checkouts if c.status in ['active', 'overdue']
+                for c in checkouts if c.status in InventoryCheckout.ACTIVE_STATUSES
             ]
         }
         return JsonResponse(data)
@@ -292,7 +344,7 @@ def inventory_item_detail_view(request, item_id):
 @require_http_methods(["GET", "POST"])
 def inventory_item_create_view(request):
     """Create inventory item - handles both form POST and JSON POST"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -301,13 +353,7 @@ def inventory_item_create_view(request):
     
     # Check permissions
     user = request.user
-    can_manage = (
-        user.is_staff or 
-        getattr(user, "is_owner", False) or 
-        getattr(user, "is_admin", False) or 
-        getattr(user, "is_pastor", False) or
-        getattr(user, "is_hod", False)
-    )
+    can_manage = user.has_roles(CAN_MANAGE_INVENTORY)
     
     if not can_manage:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -319,7 +365,7 @@ def inventory_item_create_view(request):
         is_json = request.headers.get("x-requested-with") == "XMLHttpRequest"
         
         if is_json:
-            data = json.loads(request.body)
+            data = loads_json(request.body)
         else:
             data = request.POST.copy()
             if 'image' in request.FILES:
@@ -376,7 +422,7 @@ def inventory_item_create_view(request):
                 quantity=int(data.get('quantity', 0)),
                 reorder_level=int(data.get('reorder_level', 0)),
                 reorder_quantity=int(data.get('reorder_quantity', 1)),
-                alert_on_low=bool(data.get('alert_on_low', True)),
+                alert_on_low=parse_bool(data.get('alert_on_low', True)),
                 location=data.get('location', ''),
                 condition=data.get('condition', 'good'),
                 item_type=data.get('item_type', 'supply'),
@@ -415,14 +461,14 @@ def inventory_item_create_view(request):
             purchase_date = data.get('purchase_date')
             if purchase_date:
                 try:
-                    item.purchase_date = datetime.strptime(purchase_date, '%Y-%m-%d').date()
+                    item.purchase_date = parse_form_date(purchase_date)
                 except ValueError:
                     pass
             
             warranty_expiry = data.get('warranty_expiry')
             if warranty_expiry:
                 try:
-                    item.warranty_expiry = datetime.strptime(warranty_expiry, '%Y-%m-%d').date()
+                    item.warranty_expiry = parse_form_date(warranty_expiry)
                 except ValueError:
                     pass
             
@@ -511,13 +557,19 @@ def inventory_item_create_view(request):
 @require_http_methods(["GET", "POST", "PUT"])
 def inventory_item_update_view(request, item_id):
     """Update inventory item - handles both form POST and JSON PUT"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
             return JsonResponse({'error': 'No organization assigned'}, status=400)
         return HttpResponseForbidden("No organization assigned")
     
+    # Check permissions
+    if not request.user.has_roles(CAN_MANAGE_INVENTORY):
+        if request.headers.get("x-requested-with") == "XMLHttpRequest":
+            return JsonResponse({'error': 'Permission denied'}, status=403)
+        return HttpResponseForbidden("Permission denied")
+    
     try:
         item = InventoryItem.objects.get(id=item_id, organization=organization)
     except InventoryItem.DoesNotExist:
@@ -525,26 +577,11 @@ def inventory_item_update_view(request, item_id):
             return JsonResponse({'error': 'Item not found'}, status=404)
         return HttpResponseNotFound("Item not found")
     
-    # Check permissions
-    user = request.user
-    can_manage = (
-        user.is_staff or 
-        getattr(user, "is_owner", False) or 
-        getattr(user, "is_admin", False) or 
-        getattr(user, "is_pastor", False) or
-        getattr(user, "is_hod", False)
-    )
-    
-    if not can_manage:
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
-            return JsonResponse({'error': 'Permission denied'}, status=403)
-        return HttpResponseForbidden("Permission denied")
-    
     if request.method in ['POST', 'PUT']:
         is_json = request.headers.get("x-requested-with") == "XMLHttpRequest"
         
         if is_json:
-            data = json.loads(request.body)
+            data = loads_json(request.body)
         else:
             data = request.POST.copy()
             if 'image' in request.FILES:
@@ -556,14 +593,13 @@ def inventory_item_update_view(request, item_id):
             errors['name'] = 'Item name is required'
         
         # Validate numeric fields
-        for field in ['quantity', 'reorder_level', 'reorder_quantity']:
+        for field, label in NUMERIC_FIELDS.items():
             if field in data:
                 try:
-                    value = int(data[field])
-                    if value < 0:
-                        errors[field] = f'{field.replace("_", " ").title()} cannot be negative'
+                    if int(data[field]) < 0:
+                        errors[field] = f'{label} cannot be negative'
                 except ValueError:
-                    errors[field] = f'{field.replace("_", " ").title()} must be a number'
+                    errors[field] = f'{label} must be a number'
         
         if 'purchase_price' in data and data['purchase_price']:
             try:
@@ -583,80 +619,67 @@ def inventory_item_update_view(request, item_id):
             })
         
         try:
-            # Update item fields
-            item.name = data.get('name', item.name)
-            item.description = data.get('description', item.description)
-            item.sku = data.get('sku', item.sku)
-            item.barcode = data.get('barcode', item.barcode)
-            item.asset_tag = data.get('asset_tag', item.asset_tag)
-            item.quantity = int(data.get('quantity', item.quantity))
-            item.reorder_level = int(data.get('reorder_level', item.reorder_level))
-            item.reorder_quantity = int(data.get('reorder_quantity', item.reorder_quantity))
-            item.alert_on_low = bool(data.get('alert_on_low', item.alert_on_low))
-            item.location = data.get('location', item.location)
-            item.condition = data.get('condition', item.condition)
-            item.item_type = data.get('item_type', item.item_type)
-            item.storage_instructions = data.get('storage_instructions', item.storage_instructions)
+            with transaction.atomic():
+                # Lock the row and re-read it, so fields the client didn't submit keep
+                # whatever a concurrent write stored. Submitted fields, quantity
+                # included for the web and XHR forms, still overwrite that write.
+                item = InventoryItem.objects.select_for_update().get(pk=item.pk)
             
-            # Handle price
-            purchase_price = data.get('purchase_price')
-            if purchase_price:
-                item.purchase_price = float(purchase_price)
-            elif purchase_price == '':  # Clear price if empty string
-                item.purchase_price = None
+                # Update item fields
+                item.name = data.get('name', item.name)
+                item.description = data.get('description', item.description)
+                item.sku = data.get('sku', item.sku)
+                item.barcode = data.get('barcode', item.barcode)
+                item.asset_tag = data.get('asset_tag', item.asset_tag)
+                item.quantity = int(data.get('quantity', item.quantity))
+                item.reorder_level = int(data.get('reorder_level', item.reorder_level))
+                item.reorder_quantity = int(data.get('reorder_quantity', item.reorder_quantity))
+                item.alert_on_low = parse_bool(data.get('alert_on_low', item.alert_on_low))
+                item.location = data.get('location', item.location)
+                item.condition = data.get('condition', item.condition)
+                item.item_type = data.get('item_type', item.item_type)
+                item.storage_instructions = data.get('storage_instructions', item.storage_instructions)
             
-            item.notes = data.get('notes', item.notes)
+                # Handle price
+                purchase_price = data.get('purchase_price')
+                if purchase_price:
+                    item.purchase_price = float(purchase_price)
+                elif purchase_price == '':  # Clear price if empty string
+                    item.purchase_price = None
             
-            # Handle relationships
-            category_id = data.get('category')
-            if category_id:
-                try:
-                    category = InventoryCategory.objects.get(id=category_id, organization=organization)
-                    item.category = category
-                except InventoryCategory.DoesNotExist:
-                    pass
-            elif category_id == '':  # Clear category
-                item.category = None
+                item.notes = data.get('notes', item.notes)
             
-            department_id = data.get('department')
-            if department_id:
-                try:
-                    department = Department.objects.get(id=department_id, organization=organization)
-                    item.department = department
-                except Department.DoesNotExist:
-                    pass
-            elif department_id == '':  # Clear department
-                item.department = None
+                # Handle relationships: check each submitted id against the
+                # organization's cached dropdown choices (one cache read for all
+                # three) and set the FK column without loading the row.
+                choices = get_inventory_form_choices(organization)
+                for (field, _), rows in zip(INVENTORY_ITEM_RELATIONS, choices):
+                    related_id = data.get(field)
+                    if related_id:
+                        if any(str(row['id']) == str(related_id) for row in rows):
+                            setattr(item, f'{field}_id', related_id)
+                    elif related_id == '':  # Clear the relation
+                        setattr(item, f'{field}_id', None)
             
-            vendor_id = data.get('vendor')
-            if vendor_id:
-                try:
-                    vendor = InventoryVendor.objects.get(id=vendor_id, organization=organization)
-                    item.vendor = vendor
-                except InventoryVendor.DoesNotExist:
-                    pass
-            elif vendor_id == '':  # Clear vendor
-                item.vendor = None
+                # Handle dates
+                for date_field in ['purchase_date', 'warranty_expiry']:
+                    date_value = data.get(date_field)
+                    if date_value:
+                        try:
+                            setattr(item, date_field, parse_form_date(date_value))
+                        except ValueError:
+                            pass
+                    elif date_value == '':  # Clear date
+                        setattr(item, date_field, None)
             
-            # Handle dates
-            for date_field in ['purchase_date', 'warranty_expiry']:
-                date_value = data.get(date_field)
-                if date_value:
-                    try:
-                        setattr(item, date_field, datetime.strptime(date_value, '%Y-%m-%d').date())
-                    except ValueError:
-                        pass
-                elif date_value == '':  # Clear date
-                    setattr(item, date_field, None)
+                # Handle image (for form submissions)
+                if not is_json:
+                    if 'image' in request.FILES:
+                        item.image = request.FILES['image']
+                    elif 'clear_image' in data:  # Clear image if requested
+                        item.image = None
             
-            # Handle image (for form submissions)
-            if not is_json:
-                if 'image' in request.FILES:
-                    item.image = request.FILES['image']
-                elif 'clear_image' in data:  # Clear image if requested
-                    item.image = None
-            
-            item.save()
+                item.save(update_fields=INVENTORY_ITEM_EDIT_FIELDS)
             
             if is_json:
                 return JsonResponse({
@@ -683,9 +706,7 @@ def inventory_item_update_view(request, item_id):
             })
     
     # GET request - show form with current data
-    categories = InventoryCategory.objects.filter(organization=organization)
-    departments = Department.objects.filter(organization=organization)
-    vendors = InventoryVendor.objects.filter(organization=organization)
+    categories, departments, vendors = get_inventory_form_choices(organization)
     
     context = {
         'item': item,
@@ -716,9 +737,9 @@ def inventory_item_update_view(request, item_id):
             'storage_instructions': item.storage_instructions,
             'purchase_price': float(item.purchase_price) if item.purchase_price else None,
             'notes': item.notes,
-            'category': str(item.category.id) if item.category else None,
-            'department': str(item.department.id) if item.department else None,
-            'vendor': str(item.vendor.id) if item.vendor else None,
+            'category': str(item.category_id) if item.category_id else None,
+            'department': str(item.department_id) if item.department_id else None,
+            'vendor': str(item.vendor_id) if item.vendor_id else None,
             'purchase_date': item.purchase_date.isoformat() if item.purchase_date else None,
             'warranty_expiry': item.warranty_expiry.isoformat() if item.warranty_expiry else None,
             'image_url': request.build_absolute_uri(item.image.url) if item.image else None,
@@ -726,67 +747,75 @@ def inventory_item_update_view(request, item_id):
     
     return render(request, 'inventory/items/edit.html', context)
 
-from church.models import Department
+
 @login_required
 @require_http_methods(["DELETE", "POST"])
 def inventory_item_delete_view(request, item_id):
     """Delete inventory item - handles DELETE for mobile and POST for web"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
+    is_xhr = request.headers.get("x-requested-with") == "XMLHttpRequest"
     
     if not organization:
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        if is_xhr:
             return JsonResponse({'error': 'No organization assigned'}, status=400)
         return HttpResponseForbidden("No organization assigned")
     
-    try:
-        item = InventoryItem.objects.get(id=item_id, organization=organization)
-    except InventoryItem.DoesNotExist:
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
-            return JsonResponse({'error': 'Item not found'}, status=404)
-        return HttpResponseNotFound("Item not found")
-    
     # Check permissions
-    user = request.user
-    can_manage = (
-        user.is_staff or 
-        getattr(user, "is_owner", False) or 
-        getattr(user, "is_admin", False) or 
-        getattr(user, "is_pastor", False)
-    )
-    
-    if not can_manage:
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
+    if not request.user.can_manage:
+        if is_xhr:
             return JsonResponse({'error': 'Permission denied'}, status=403)
         return HttpResponseForbidden("Permission denied")
     
-    # Check if item has active checkouts
+    items = InventoryItem.objects.filter(id=item_id, organization=organization)
+    
+    # Items with active checkouts can't be deleted. The check rides along with
+    # delete() as a NOT EXISTS filter, so the guard and the delete are one query;
+    # nothing deleted means an active checkout blocked it.
     active_checkouts = InventoryCheckout.objects.filter(
-        item=item,
-        status__in=['active', 'overdue']
-    ).exists()
+        item=OuterRef('pk'),
+        status__in=InventoryCheckout.ACTIVE_STATUSES
+    )
+    has_checkout_history = False
+    try:
+        with transaction.atomic():
+            # Lock the item so no checkout can be created for it until the delete
+            # commits. Only the name and SKU are needed for the response.
+            item = items.select_for_update().values('name', 'sku').first()
+            if item is not None:
+                deleted, _ = items.exclude(Exists(active_checkouts)).delete()
+    except ProtectedError:
+        # Returned/lost/damaged checkouts keep the item (on_delete=PROTECT)
+        deleted, has_checkout_history = 0, True
+    
+    if item is None:
+        if is_xhr:
+            return JsonResponse({'error': 'Item not found'}, status=404)
+        return HttpResponseNotFound("Item not found")
     
-    if active_checkouts:
-        message = f"Cannot delete '{item.name}' because it has active checkouts. Please return all items first."
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
+    item_name = item['name']
+    
+    if not deleted:
+        if has_checkout_history:
+            message = f"Cannot delete '{item_name}' because it has checkout history."
+        else:
+            message = f"Cannot delete '{item_name}' because it has active checkouts. Please return all items first."
+        if is_xhr:
             return JsonResponse({'error': message}, status=400)
         messages.error(request, message)
-        return redirect('inventory_item_detail', item_id=item.id)
-    
-    # Store item info for response
-    item_name = item.name
-    item_sku = item.sku
+        return redirect('inventory_item_detail', item_id=item_id)
     
-    # Delete item
-    item.delete()
-    
-    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+    if is_xhr or request.method == 'DELETE':
+        # Plain DELETE clients only need the status; send the body to callers
+        # that ask for JSON and to the web page's XHR.
+        if not is_xhr and 'application/json' not in request.headers.get('Accept', ''):
+            return HttpResponse(status=204)
         return JsonResponse({
             'success': True,
             'message': f"Item '{item_name}' has been deleted.",
             'deleted_item': {
                 'id': item_id,
                 'name': item_name,
-                'sku': item_sku,
+                'sku': item['sku'],
             }
         })
     
@@ -797,7 +826,7 @@ def inventory_item_delete_view(request, item_id):
 @login_required
 def inventory_checkout_list_view(request):
     """List inventory checkouts - JSON for mobile, HTML for web"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -870,7 +899,7 @@ from member.models import Member
 @require_http_methods(["GET", "POST"])
 def inventory_checkout_create_view(request):
     """Create inventory checkout - handles both form POST and JSON POST"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -879,13 +908,7 @@ def inventory_checkout_create_view(request):
     
     # Check permissions
     user = request.user
-    can_checkout = (
-        user.is_staff or 
-        getattr(user, "is_owner", False) or 
-        getattr(user, "is_admin", False) or 
-        getattr(user, "is_pastor", False) or
-        getattr(user, "is_hod", False)
-    )
+    can_checkout = user.has_roles(CAN_MANAGE_INVENTORY)
     
     if not can_checkout:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -896,7 +919,7 @@ def inventory_checkout_create_view(request):
         is_json = request.headers.get("x-requested-with") == "XMLHttpRequest"
         
         if is_json:
-            data = json.loads(request.body)
+            data = loads_json(request.body)
         else:
             data = request.POST.copy()
         
@@ -956,7 +979,7 @@ def inventory_checkout_create_view(request):
                 quantity=int(data['quantity']),
                 purpose=data.get('purpose', ''),
                 event_name=data.get('event_name', ''),
-                due_date=datetime.strptime(data['due_date'], '%Y-%m-%d').date() if data.get('due_date') else None,
+                due_date=parse_form_date(data['due_date']) if data.get('due_date') else None,
                 status='active',
                 created_by=request.user,
                 approved_by=request.user,
@@ -1066,7 +1089,7 @@ def inventory_checkout_create_view(request):
 @require_http_methods(["POST"])
 def inventory_checkout_return_view(request, checkout_id):
     """Process item return"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return JsonResponse({'error': 'No organization assigned'}, status=400)
@@ -1079,13 +1102,7 @@ def inventory_checkout_return_view(request, checkout_id):
         
         # Check permissions
         user = request.user
-        can_manage = (
-            user.is_staff or 
-            getattr(user, "is_owner", False) or 
-            getattr(user, "is_admin", False) or 
-            getattr(user, "is_pastor", False) or
-            getattr(user, "is_hod", False)
-        )
+        can_manage = user.has_roles(CAN_MANAGE_INVENTORY)
         
         if not can_manage:
             if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -1169,7 +1186,7 @@ def inventory_checkout_return_view(request, checkout_id):
 @require_http_methods(["POST"])
 def inventory_checkout_extend_view(request, checkout_id):
     """Extend checkout due date"""
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         return JsonResponse({'error': 'No organization assigned'}, status=400)
@@ -1182,13 +1199,7 @@ def inventory_checkout_extend_view(request, checkout_id):
         
         # Check permissions
         user = request.user
-        can_manage = (
-            user.is_staff or 
-            getattr(user, "is_owner", False) or 
-            getattr(user, "is_admin", False) or 
-            getattr(user, "is_pastor", False) or
-            getattr(user, "is_hod", False)
-        )
+        can_manage = user.has_roles(CAN_MANAGE_INVENTORY)
         
         if not can_manage:
             if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -1206,7 +1217,7 @@ def inventory_checkout_extend_view(request, checkout_id):
         
         # Validate date
         try:
-            due_date = datetime.strptime(new_due_date, '%Y-%m-%d').date()
+            due_date = parse_form_date(new_due_date)
             if due_date < timezone.now().date():
                 if request.headers.get("x-requested-with") == "XMLHttpRequest":
                     return JsonResponse({'error': 'Due date cannot be in the past'}, status=400)
@@ -5,6 +5,22 @@ from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
 
 
+class OrgScopedQuerySet(models.QuerySet):
+    """Querysets for rows owned by a church organization."""
+
+    def for_organization(self, organization):
+        if not organization:
+            return self.none()
+        return self.filter(organization_id=organization.pk)
+
+    def for_user(self, user):
+        # Compare the FK column so the user's Organization row is never loaded.
+        organization_id = getattr(user, "organization_id", None)
+        if not organization_id:
+            return self.none()
+        return self.filter(organization_id=organization_id)
+
+
 class Campus(models.Model):
     """Church campus/branch location."""
 
@@ -18,6 +34,8 @@ class Campus(models.Model):
     email = models.EmailField(blank=True)
     is_active = models.BooleanField(default=True)
 
+    objects = OrgScopedQuerySet.as_manager()
+
     class Meta:
         app_label = "church"
         verbose_name_plural = "Campuses"
@@ -165,10 +183,18 @@ class Member(models.Model):
         related_name="created_members",
     )
 
+    objects = OrgScopedQuerySet.as_manager()
+
     class Meta:
         app_label = "church"
         ordering = ["last_name", "first_name"]
         unique_together = ["organization", "email"]
+        # Member lists are always scoped to one organization and read in the
+        # default name order; the dashboards also count members per status.
+        indexes = [
+            models.Index(fields=["organization", "last_name", "first_name"]),
+            models.Index(fields=["organization", "status"]),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.organization.slug})"
@@ -208,6 +234,8 @@ class Family(models.Model):
         related_name="headed_families",
     )
 
+    objects = OrgScopedQuerySet.as_manager()
+
     class Meta:
         app_label = "church"
         verbose_name_plural = "Families"
@@ -234,6 +262,9 @@ class Department(models.Model):
         related_name="led_departments",
     )
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OrgScopedQuerySet.as_manager()
 
     class Meta:
         app_label = "church"
@@ -6,13 +6,12 @@ from django.db.models import Q  # ADD THIS IMPORT
 from django.views.decorators.http import require_http_methods
 
 from .models import Member, Campus, Department, Family
-from church.views import get_user_organization
 
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status, viewsets, filters
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
 from .serializers import MemberSerializer, DepartmentSerializer, FamilySerializer, CampusSerializer
 
@@ -20,8 +19,7 @@ from .serializers import MemberSerializer, DepartmentSerializer, FamilySerialize
 @login_required
 def member_list_view(request):
     """List members - JSON for mobile, HTML for web (same as dashboard_view)."""
-    user = request.user
-    organization = get_user_organization(request.user)
+    organization = request.organization
     
     if not organization:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
@@ -65,20 +63,17 @@ def member_list_view(request):
     # Check if it's an API/mobile request (YOUR EXISTING PATTERN)
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
         # Return JSON for mobile (like your dashboard_view does)
-        data = [
-            {
-                'id': str(m.id),
-                'full_name': f"{m.first_name} {m.last_name}",
-                'first_name': m.first_name,
-                'last_name': m.last_name,
-                'email': m.email,
-                'phone': str(m.phone) if m.phone else '',
-                'status': m.status,
-                'join_date': m.join_date.isoformat() if m.join_date else None,
-                'photo_url': request.build_absolute_uri(m.photo.url) if m.photo else None,
-            }
-            for m in members
-        ]
+        # Read plain rows; JsonResponse's DjangoJSONEncoder writes the UUIDs and dates.
+        photo_storage = Member._meta.get_field('photo').storage
+        data = []
+        for row in members.values(
+            'id', 'first_name', 'last_name', 'email', 'phone', 'status', 'join_date', 'photo'
+        ):
+            photo = row.pop('photo')
+            row['full_name'] = f"{row['first_name']} {row['last_name']}"
+            row['phone'] = str(row['phone']) if row['phone'] else ''
+            row['photo_url'] = request.build_absolute_uri(photo_storage.url(photo)) if photo else None
+            data.append(row)
         return JsonResponse({'members': data})
     
     # Return HTML for web (like your dashboard_view does)
@@ -185,27 +180,22 @@ def member_delete_view(request, member_id):
     Delete member - handles DELETE for mobile API and POST for web forms.
     GET shows confirmation page for web.
     """
-    try:
-        member = Member.objects.get(id=member_id, organization=request.user.organization)
-    except Member.DoesNotExist:
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
-            return JsonResponse({'error': 'Member not found'}, status=404)
-        return HttpResponseNotFound("Member not found")
-
     # Check permissions (admin/pastor/owner can delete)
     user = request.user
-    can_delete = (
-        user.is_staff
-        or getattr(user, "is_owner", False)
-        or getattr(user, "is_admin", False)
-        or getattr(user, "is_pastor", False)
-    )
+    can_delete = user.can_manage
 
     if not can_delete:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
             return JsonResponse({'error': 'Permission denied'}, status=403)
         return HttpResponseForbidden("Permission denied")
 
+    try:
+        member = Member.objects.get(id=member_id, organization=request.user.organization)
+    except Member.DoesNotExist:
+        if request.headers.get("x-requested-with") == "XMLHttpRequest":
+            return JsonResponse({'error': 'Member not found'}, status=404)
+        return HttpResponseNotFound("Member not found")
+
     if request.method in ["DELETE", "POST"]:
         soft_delete = request.POST.get("soft_delete", False) or (
             request.headers.get("x-requested-with") == "XMLHttpRequest"
@@ -264,27 +254,22 @@ def member_delete_view(request, member_id):
 @require_http_methods(["GET", "POST", "PUT"])
 def member_edit_view(request, member_id):
     """Edit member - handles both form POST and JSON PUT."""
-    try:
-        member = Member.objects.get(id=member_id, organization=request.user.organization)
-    except Member.DoesNotExist:
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
-            return JsonResponse({'error': 'Member not found'}, status=404)
-        return HttpResponseNotFound("Member not found")
-    
     # Check permissions (admin/pastor/owner can edit)
     user = request.user
-    can_edit = (
-        user.is_staff or 
-        getattr(user, "is_owner", False) or 
-        getattr(user, "is_admin", False) or 
-        getattr(user, "is_pastor", False)
-    )
+    can_edit = user.can_manage
     
     if not can_edit:
         if request.headers.get("x-requested-with") == "XMLHttpRequest":
             return JsonResponse({'error': 'Permission denied'}, status=403)
         return HttpResponseForbidden("Permission denied")
     
+    try:
+        member = Member.objects.get(id=member_id, organization=request.user.organization)
+    except Member.DoesNotExist:
+        if request.headers.get("x-requested-with") == "XMLHttpRequest":
+            return JsonResponse({'error': 'Member not found'}, status=404)
+        return HttpResponseNotFound("Member not found")
+    
     if request.method in ['POST', 'PUT']:
         # Get data based on content type
         is_json = request.headers.get("x-requested-with") == "XMLHttpRequest"
@@ -532,8 +517,7 @@ def member_edit_view(request, member_id):
 @login_required
 def member_statistics_view(request):
     """Member statistics - JSON for mobile, HTML for web."""
-    user = request.user
-    organization = get_user_organization(request.user)
+    organization = request.organization
 
 
     
@@ -564,12 +548,11 @@ def member_statistics_view(request):
     
     
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_list_api_view(request):
     """API endpoint for listing members with filtering and search."""
-    user = request.user
-    organization = get_user_organization(user)
+    organization = request.organization
     
     if not organization:
         return Response(
@@ -635,12 +618,12 @@ def member_list_api_view(request):
         })
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_detail_api_view(request, member_id):
     """API endpoint for single member details."""
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response(
                 {'error': 'No organization assigned'}, 
@@ -685,15 +668,15 @@ def format_date_for_model(date_value):
 
 
 @api_view(["POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_create_api_view(request):
-    organization = get_user_organization(request.user)
+    organization = request.organization
     if not organization:
         return Response({"error": "No organization assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
     user = request.user
-    can_create = user.is_staff or getattr(user, "is_owner", False) or getattr(user, "is_admin", False) or getattr(user, "is_pastor", False)
+    can_create = user.can_manage
     if not can_create:
         return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
 
@@ -739,20 +722,21 @@ def member_create_api_view(request):
 
 
 @api_view(["PUT", "PATCH"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_update_api_view(request, member_id):
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response({"error": "No organization assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
-        member = Member.objects.get(id=member_id, organization=organization)
         user = request.user
-        can_edit = user.is_staff or getattr(user, "is_owner", False) or getattr(user, "is_admin", False) or getattr(user, "is_pastor", False)
+        can_edit = user.can_manage
         if not can_edit:
             return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
 
+        member = Member.objects.get(id=member_id, organization=organization)
+
         data = request.data.copy()
         data["organization"] = str(organization.id)
 
@@ -811,20 +795,21 @@ def member_update_api_view(request, member_id):
 
 
 @api_view(["DELETE"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_delete_api_view(request, member_id):
     try:
-        organization = get_user_organization(request.user)
+        organization = request.organization
         if not organization:
             return Response({"error": "No organization assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
-        member = Member.objects.get(id=member_id, organization=organization)
         user = request.user
-        can_delete = user.is_staff or getattr(user, "is_owner", False) or getattr(user, "is_admin", False) or getattr(user, "is_pastor", False)
+        can_delete = user.can_manage
         if not can_delete:
             return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
 
+        member = Member.objects.get(id=member_id, organization=organization)
+
         soft_delete = request.query_params.get("soft_delete", "false").lower() == "true"
         member_name = member.full_name
 
@@ -854,10 +839,10 @@ def member_delete_api_view(request, member_id):
 
 
 @api_view(["GET"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def member_statistics_api_view(request):
-    organization = get_user_organization(request.user)
+    organization = request.organization
     if not organization:
         return Response({"error": "No organization assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
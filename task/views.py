@@ -16,7 +16,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import OrganizationJWTAuthentication
 
 from church.models import Department
 from chat.models import Message as ChatMessage, Channel, DirectMessage, ChannelMembership
@@ -30,18 +30,6 @@ User = get_user_model()
 channel_layer = get_channel_layer()
 
 
-def get_user_organization(user):
-    """Get user's organization with fallbacks"""
-    if hasattr(user, 'organization') and user.organization:
-        return user.organization
-    
-    # fallback if user belongs via profile or membership
-    if hasattr(user, 'profile') and hasattr(user.profile, 'organization'):
-        return user.profile.organization
-    
-    return None
-
-
 def display_name_for(user):
     """Get display name for user"""
     if hasattr(user, "member_profile") and user.member_profile:
@@ -125,7 +113,7 @@ def _broadcast_chat_message(message):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_dashboard_api_view(request):
     """
@@ -249,7 +237,7 @@ def task_dashboard_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_list_api_view(request):
     """
@@ -466,7 +454,7 @@ def task_list_api_view(request):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_create_api_view(request):
     """
@@ -667,7 +655,7 @@ def task_create_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_detail_api_view(request, task_id):
     """
@@ -693,7 +681,7 @@ def task_detail_api_view(request, task_id):
             )
     
     # Check organization access
-    if task.organization != user.organization:
+    if task.organization_id != user.organization_id:
         return Response(
             {'success': False, 'error': 'Task not found in your organization'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -937,7 +925,7 @@ def task_detail_api_view(request, task_id):
 
 
 @api_view(['PUT', 'PATCH'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_update_api_view(request, task_id):
     """
@@ -961,7 +949,7 @@ def task_update_api_view(request, task_id):
         )
     
     # Check organization access
-    if task.organization != user.organization:
+    if task.organization_id != user.organization_id:
         return Response(
             {'success': False, 'error': 'Task not found in your organization'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -1134,7 +1122,7 @@ def task_update_api_view(request, task_id):
 
 
 @api_view(['DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_delete_api_view(request, task_id):
     """
@@ -1158,7 +1146,7 @@ def task_delete_api_view(request, task_id):
         )
     
     # Check organization access
-    if task.organization != user.organization:
+    if task.organization_id != user.organization_id:
         return Response(
             {'success': False, 'error': 'Task not found in your organization'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -1174,7 +1162,7 @@ def task_delete_api_view(request, task_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_add_comment_api_view(request, task_id):
     """
@@ -1200,7 +1188,7 @@ def task_add_comment_api_view(request, task_id):
             )
     
     # Check organization access
-    if task.organization != user.organization:
+    if task.organization_id != user.organization_id:
         return Response(
             {'success': False, 'error': 'Task not found in your organization'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -1271,7 +1259,7 @@ def task_add_comment_api_view(request, task_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_add_checklist_api_view(request, task_id):
     """
@@ -1296,7 +1284,7 @@ def task_add_checklist_api_view(request, task_id):
         )
     
     # Check organization access
-    if task.organization != user.organization:
+    if task.organization_id != user.organization_id:
         return Response(
             {'success': False, 'error': 'Task not found in your organization'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -1331,7 +1319,7 @@ def task_add_checklist_api_view(request, task_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_toggle_checklist_api_view(request, task_id, checklist_id):
     """
@@ -1349,7 +1337,7 @@ def task_toggle_checklist_api_view(request, task_id, checklist_id):
         )
     
     # Check organization access
-    if task.organization != user.organization:
+    if task.organization_id != user.organization_id:
         return Response(
             {'success': False, 'error': 'Task not found in your organization'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -1398,7 +1386,7 @@ def task_toggle_checklist_api_view(request, task_id, checklist_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_start_timer_api_view(request, task_id):
     """
@@ -1423,7 +1411,7 @@ def task_start_timer_api_view(request, task_id):
         )
     
     # Check organization access
-    if task.organization != user.organization:
+    if task.organization_id != user.organization_id:
         return Response(
             {'success': False, 'error': 'Task not found in your organization'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -1464,7 +1452,7 @@ def task_start_timer_api_view(request, task_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_stop_timer_api_view(request, task_id):
     """
@@ -1481,7 +1469,7 @@ def task_stop_timer_api_view(request, task_id):
         )
     
     # Check organization access
-    if task.organization != user.organization:
+    if task.organization_id != user.organization_id:
         return Response(
             {'success': False, 'error': 'Task not found in your organization'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -1528,7 +1516,7 @@ def task_stop_timer_api_view(request, task_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def convert_message_to_task_api_view(request):
     """
@@ -1742,7 +1730,7 @@ def convert_message_to_task_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def get_message_task_suggestions_api_view(request, message_id):
     """
@@ -1796,7 +1784,7 @@ def get_message_task_suggestions_api_view(request, message_id):
     assignee_suggestions = []
     
     for mention in mentions:
-        if mention.user and mention.user.organization == user.organization:
+        if mention.user and mention.user.organization_id == user.organization_id:
             assignee_name = display_name_for(mention.user)
             assignee_avatar = None
             try:
@@ -1824,7 +1812,7 @@ def get_message_task_suggestions_api_view(request, message_id):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_labels_api_view(request):
     """
@@ -1863,7 +1851,7 @@ def task_labels_api_view(request):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def create_task_label_api_view(request):
     """
@@ -1930,7 +1918,7 @@ def create_task_label_api_view(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def task_notifications_api_view(request):
     """
@@ -1983,7 +1971,7 @@ def task_notifications_api_view(request):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def mark_notification_read_api_view(request, notification_id):
     """
@@ -2009,7 +1997,7 @@ def mark_notification_read_api_view(request, notification_id):
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([OrganizationJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def mark_all_notifications_read_api_view(request):
     """